@@ -11,8 +11,11 @@ IF %ERRORLEVEL% NEQ 0 (
 REM Ask the user for the YouTube video link
 set /p video_url=Please enter the YouTube video URL: 
 
-REM Run the command to download comments
-youtube-comment-downloader --url %video_url% --output comments.json
-
-echo Comments have been successfully saved.
+REM Stream the comments to comments_<video_id>.jsonl
+python "%~dp0comment_fetcher.py" %video_url%
+IF %ERRORLEVEL% NEQ 0 (
+    echo Could not download comments.
+) ELSE (
+    echo Comments have been successfully saved.
+)
 pause
@@ -1,6 +1,9 @@
 import customtkinter as ctk
-import os
+import re
 import threading
+import time
+
+from comment_fetcher import download_batch
 
 # Initialize the app theme
 ctk.set_appearance_mode("System")  # "Dark", "Light", or "System"
@@ -11,7 +14,7 @@ class YouTubeCommentDownloader(ctk.CTk):
         super().__init__()
 
         self.title("YouTube Comment Downloader")
-        self.geometry("500x300")
+        self.geometry("500x340")
         self.resizable(False, False)
 
         # Title Label
@@ -19,34 +22,75 @@ class YouTubeCommentDownloader(ctk.CTk):
         self.title_label.pack(pady=10)
 
         # URL Input
-        self.url_entry = ctk.CTkEntry(self, placeholder_text="Enter YouTube Video URL", width=400)
+        self.url_entry = ctk.CTkEntry(self, placeholder_text="Enter YouTube Video URL(s)", width=400)
         self.url_entry.pack(pady=10)
 
-        # Download Button
+        # Download / Cancel Buttons
         self.download_button = ctk.CTkButton(self, text="Download Comments", command=self.start_download)
         self.download_button.pack(pady=10)
+        self.cancel_button = ctk.CTkButton(self, text="Cancel", command=self.cancel_download,
+                                           fg_color="gray", state="disabled")
+        self.cancel_button.pack(pady=5)
 
         # Status Label
         self.status_label = ctk.CTkLabel(self, text="", font=("Arial", 14))
         self.status_label.pack(pady=10)
 
+        self.cancel_event = None
+        self.progress = {}
+        self.progress_lock = threading.Lock()
+
+    def set_status(self, text, color):
+        # Tk widgets may only be touched from the main thread
+        self.after(0, lambda: self.status_label.configure(text=text, text_color=color))
+
     def start_download(self):
-        video_url = self.url_entry.get().strip()
-        if not video_url:
+        # Several URLs may be separated by spaces or commas
+        video_urls = [u for u in re.split(r"[\s,]+", self.url_entry.get().strip()) if u]
+        if not video_urls:
             self.status_label.configure(text="❌ Please enter a valid URL.", text_color="red")
             return
 
+        self.cancel_event = threading.Event()
+        self.progress = {}
+        self.download_button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
         self.status_label.configure(text="⏳ Downloading comments...", text_color="orange")
-        threading.Thread(target=self.download_comments, args=(video_url,), daemon=True).start()
+        threading.Thread(target=self.download_comments, args=(video_urls,), daemon=True).start()
+
+    def cancel_download(self):
+        if self.cancel_event:
+            self.cancel_event.set()
+            self.status_label.configure(text="⏳ Cancelling...", text_color="orange")
+
+    def on_progress(self, url, count, rate):
+        with self.progress_lock:
+            self.progress[url] = (count, rate)
+            total = sum(c for c, _ in self.progress.values())
+            speed = sum(r for _, r in self.progress.values())
+        if not self.cancel_event.is_set():
+            self.set_status(f"⏳ {total} comments ({speed:.0f}/s) from {len(self.progress)} video(s)", "orange")
 
-    def download_comments(self, video_url):
-        command = f'youtube-comment-downloader --url "{video_url}" --output comments.json'
-        result = os.system(command)
+    def download_comments(self, video_urls):
+        start = time.perf_counter()
+        try:
+            results = download_batch(video_urls, on_progress=self.on_progress, cancel=self.cancel_event)
+            total = sum(r["count"] for r in results)
+            errors = [r for r in results if r["error"]]
+            elapsed = time.perf_counter() - start
 
-        if result == 0:
-            self.status_label.configure(text="✅ Comments saved successfully!", text_color="green")
-        else:
-            self.status_label.configure(text="❌ Error: Could not download comments.", text_color="red")
+            if self.cancel_event.is_set():
+                self.set_status(f"⏹ Cancelled after {total} comments.", "orange")
+            elif errors:
+                self.set_status(f"❌ Error: {errors[0]['error']}", "red")
+            else:
+                self.set_status(f"✅ Saved {total} comments in {elapsed:.1f}s!", "green")
+        except Exception as e:
+            self.set_status(f"❌ Error: {e}", "red")
+        finally:
+            # Always hand the buttons back, whatever happened above
+            self.after(0, lambda: self.download_button.configure(state="normal"))
+            self.after(0, lambda: self.cancel_button.configure(state="disabled"))
 
 if __name__ == "__main__":
     app = YouTubeCommentDownloader()
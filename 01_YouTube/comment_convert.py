@@ -0,0 +1,250 @@
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from array import array
+
+# Settings
+CHUNK_ROWS = 50_000         # Rows held in memory before each write
+COLUMNS = ["id", "cid", "text", "time", "author", "votes", "reply", "heart"]
+VOTE_SUFFIX = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+
+def parse_votes(votes):
+    """
+    Convert YouTube like counts ("0", "15", "1.2K", "3M", "1,234") to int.
+    """
+    if isinstance(votes, (int, float)):
+        return int(votes)
+    text = str(votes or "").strip().replace(",", "").upper()
+    match = re.match(r"^(\d+(?:\.\d+)?)\s*([KMB]?)", text)
+    if not match:
+        return 0
+    number, suffix = match.groups()
+    return int(round(float(number) * VOTE_SUFFIX.get(suffix, 1)))
+
+
+def parse_bool(value):
+    """
+    Convert JSON booleans or their string forms ("True", "false", "1") to bool.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+def iter_rows(input_file):
+    """
+    Yield one typed row per comment from a JSON Lines dump, in COLUMNS order.
+    """
+    with open(input_file, "r", encoding="utf-8") as f:
+        i = 0
+        for line in f:
+            if not line.strip():
+                continue
+            js = json.loads(line)
+            yield (i, js.get("cid", ""), js.get("text", "").strip(), js.get("time", ""),
+                   js.get("author", ""), parse_votes(js.get("votes")),
+                   parse_bool(js.get("reply")), parse_bool(js.get("heart")))
+            i += 1
+
+
+def has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def columnar_path(input_file):
+    """
+    Default columnar output next to the dump: .parquet, or .npz without pyarrow.
+    """
+    stem = os.path.splitext(input_file)[0]
+    return stem + (".parquet" if has_pyarrow() else ".npz")
+
+
+class _ArrowSink:
+    """
+    Write row chunks as Parquet row groups or Feather record batches.
+    """
+
+    def __init__(self, path):
+        import pyarrow as pa
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ("id", pa.int64()), ("cid", pa.string()), ("text", pa.string()),
+            ("time", pa.string()), ("author", pa.string()), ("votes", pa.int64()),
+            ("reply", pa.bool_()), ("heart", pa.bool_()),
+        ])
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(path, self.schema)
+            self.write_chunk = self.writer.write_table
+        else:
+            import pyarrow.ipc as ipc
+            self.writer = ipc.new_file(path, self.schema)
+            self.write_chunk = self.writer.write_table
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self.write_chunk(self.pa.table(
+            [self.pa.array(col, type=field.type) for col, field in zip(columns, self.schema)],
+            schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class _NpzSink:
+    """
+    Fallback without pyarrow: numeric columns as typed arrays, string columns
+    as one UTF-8 blob plus int64 offsets (no pickled objects in the file).
+    Each column is streamed to a temporary raw file and only copied into the
+    .npz archive on close, so memory stays bounded by the chunk size.
+    """
+    NUMBERS = {"id": ("q", "<i8"), "votes": ("q", "<i8"), "reply": ("b", "|b1"), "heart": ("b", "|b1")}
+    STRINGS = ("cid", "text", "time", "author")
+
+    def __init__(self, path):
+        self.path = path
+        self.tmpdir = tempfile.mkdtemp(prefix="npz-", dir=os.path.dirname(os.path.abspath(path)))
+        self.files = {}
+        self.lengths = {}           # member name -> (numpy dtype, element count)
+        for name, (_, dtype) in self.NUMBERS.items():
+            self._open(name, dtype)
+        for name in self.STRINGS:
+            self._open(name, "|u1")
+            self._open(name + "_offsets", "<i8")
+            self._append(name + "_offsets", array("q", [0]))
+        self.blob_sizes = dict.fromkeys(self.STRINGS, 0)
+
+    def _open(self, member, dtype):
+        self.files[member] = open(os.path.join(self.tmpdir, member), "wb")
+        self.lengths[member] = (dtype, 0)
+
+    def _append(self, member, values):
+        self.files[member].write(values.tobytes())
+        dtype, count = self.lengths[member]
+        self.lengths[member] = (dtype, count + len(values))
+
+    def write(self, rows):
+        columns = dict(zip(COLUMNS, zip(*rows)))
+        for name, (typecode, _) in self.NUMBERS.items():
+            self._append(name, array(typecode, (int(v) for v in columns[name])))
+        for name in self.STRINGS:
+            encoded = [value.encode("utf-8") for value in columns[name]]
+            offsets = array("q")
+            size = self.blob_sizes[name]
+            for data in encoded:
+                size += len(data)
+                offsets.append(size)
+            self.blob_sizes[name] = size
+            self._append(name, array("B", b"".join(encoded)))
+            self._append(name + "_offsets", offsets)
+
+    def close(self):
+        import numpy as np
+
+        try:
+            with zipfile.ZipFile(self.path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+                for member, f in self.files.items():
+                    f.close()
+                    dtype, count = self.lengths[member]
+                    with zf.open(member + ".npy", "w", force_zip64=True) as out, \
+                            open(f.name, "rb") as raw:
+                        np.lib.format.write_array_header_1_0(
+                            out, {"descr": dtype, "fortran_order": False, "shape": (count,)})
+                        shutil.copyfileobj(raw, out)
+        finally:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+def _columnar_sink(path):
+    if path.endswith((".parquet", ".feather", ".arrow")):
+        return _ArrowSink(path)
+    if path.endswith(".npz"):
+        return _NpzSink(path)
+    raise ValueError(f"Unsupported columnar format: {path} (use .parquet, .feather or .npz)")
+
+
+def convert(input_file, csv_file=None, columnar_file=None, chunk_rows=CHUNK_ROWS):
+    """
+    Stream a JSON Lines comment dump into a CSV and/or a typed columnar file.
+    Only `chunk_rows` rows are held at once for CSV/Parquet/Feather output.
+    Returns the number of comments converted.
+    """
+    csv_fp = open(csv_file, "w", encoding="utf-8", newline="") if csv_file else None
+    writer = csv.writer(csv_fp) if csv_fp else None
+    sink = _columnar_sink(columnar_file) if columnar_file else None
+    count = 0
+
+    try:
+        if writer:
+            writer.writerow(COLUMNS)
+        chunk = []
+        for row in iter_rows(input_file):
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                if writer:
+                    writer.writerows(chunk)
+                if sink:
+                    sink.write(chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            if writer:
+                writer.writerows(chunk)
+            if sink:
+                sink.write(chunk)
+            count += len(chunk)
+    finally:
+        if csv_fp:
+            csv_fp.close()
+        if sink:
+            sink.close()
+    return count
+
+
+def load_comments(path, columns=None):
+    """
+    Load a converted file (.parquet, .feather, .npz or .csv) into a DataFrame.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    if path.endswith((".feather", ".arrow")):
+        return pd.read_feather(path, columns=columns)
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            frame = {}
+            for name in columns or COLUMNS:
+                if name + "_offsets" in data:
+                    blob, offsets = data[name].tobytes(), data[name + "_offsets"]
+                    frame[name] = [blob[offsets[i]:offsets[i + 1]].decode("utf-8")
+                                   for i in range(len(offsets) - 1)]
+                else:
+                    frame[name] = data[name]
+        return pd.DataFrame(frame)
+    return pd.read_csv(path, usecols=columns, dtype={"cid": str, "text": str, "author": str},
+                       keep_default_na=False)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 comment_convert.py <comments.jsonl> [out.csv] [out.parquet|out.feather|out.npz]")
+        sys.exit(1)
+
+    input_file = sys.argv[1]
+    csv_file = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(input_file)[0] + ".csv"
+    columnar_file = sys.argv[3] if len(sys.argv) > 3 else columnar_path(input_file)
+    count = convert(input_file, csv_file, columnar_file)
+    print(f"✅ Converted {count} comments → {csv_file}, {columnar_file}")
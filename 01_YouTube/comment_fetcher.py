@@ -0,0 +1,235 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, parse_qs
+
+# Settings
+SORT_BY_POPULAR = 0         # Same values as youtube-comment-downloader
+SORT_BY_RECENT = 1
+WRITE_BUFFER = 1 << 16      # File buffer size in bytes
+FLUSH_EVERY = 500           # Comments collected before one write() call
+PROGRESS_EVERY = 0.5        # Seconds between progress callbacks
+MAX_WORKERS = 4             # Videos fetched at the same time in a batch
+
+
+def video_id(url):
+    """
+    Extract the video id from a YouTube URL.
+    Falls back to a filesystem-safe version of the input.
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    if host.endswith("youtu.be"):
+        vid = parsed.path.lstrip("/").split("/")[0]
+    elif parsed.path.startswith(("/shorts/", "/live/", "/embed/")):
+        vid = parsed.path.split("/")[2]
+    else:
+        vid = parse_qs(parsed.query).get("v", [""])[0]
+    return vid or re.sub(r"[^\w-]+", "_", url.strip()).strip("_") or "video"
+
+
+def default_downloader():
+    """
+    Create the real comment API client (youtube-comment-downloader).
+    """
+    try:
+        from youtube_comment_downloader import YoutubeCommentDownloader
+    except ImportError:
+        raise ImportError(
+            "youtube-comment-downloader is not installed "
+            "(pip install youtube-comment-downloader)")
+    return YoutubeCommentDownloader()
+
+
+class ReplayDownloader:
+    """
+    Local stand-in for the comment API.
+    Replays recorded JSONL dumps: `source` is a single dump used for every
+    URL, or a directory holding `<video_id>.jsonl` / `comments_<video_id>.jsonl`.
+    `delay` sleeps between comments to mimic network pacing.
+    """
+
+    def __init__(self, source, delay=0.0):
+        self.source = source
+        self.delay = delay
+
+    def _path(self, url):
+        if not os.path.isdir(self.source):
+            return self.source
+        vid = video_id(url)
+        for name in (f"{vid}.jsonl", f"comments_{vid}.jsonl", f"{vid}.json"):
+            path = os.path.join(self.source, name)
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"No recorded comments for '{vid}' in {self.source}")
+
+    def get_comments_from_url(self, youtube_url, sort_by=SORT_BY_RECENT, language=None, sleep=0):
+        with open(self._path(youtube_url), "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if self.delay:
+                    time.sleep(self.delay)
+                yield json.loads(line)
+
+
+def stream_comments(url, downloader=None, sort_by=SORT_BY_RECENT, cancel=None):
+    """
+    Yield comment dicts for one video until exhausted or `cancel` is set.
+    """
+    downloader = downloader or default_downloader()
+    for comment in downloader.get_comments_from_url(url, sort_by=sort_by):
+        if cancel is not None and cancel.is_set():
+            return
+        yield comment
+
+
+def download_comments(url, out_dir=".", output=None, downloader=None,
+                      sort_by=SORT_BY_RECENT, on_progress=None, cancel=None):
+    """
+    Stream the comments of one video into a JSON Lines file.
+    Writes go to `<output>.part` and are renamed on completion, so a
+    cancelled or failed run never clobbers an earlier complete dump.
+    A partial file is kept only if it holds at least one comment.
+    `on_progress(count, rate)` is called every PROGRESS_EVERY seconds.
+    Returns a result dict (url, path, count, seconds, cancelled, error).
+    """
+    output = output or os.path.join(out_dir, f"comments_{video_id(url)}.jsonl")
+    partial = output + ".part"
+    result = {"url": url, "path": output, "count": 0, "seconds": 0.0,
+              "cancelled": False, "error": None}
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    start = last_report = time.perf_counter()
+    count = 0
+    pending = []
+
+    try:
+        with open(partial, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            for comment in stream_comments(url, downloader, sort_by, cancel):
+                pending.append(json.dumps(comment, ensure_ascii=False))
+                count += 1
+                if len(pending) >= FLUSH_EVERY:
+                    f.write("\n".join(pending) + "\n")
+                    pending.clear()
+
+                now = time.perf_counter()
+                if on_progress and now - last_report >= PROGRESS_EVERY:
+                    on_progress(count, count / (now - start))
+                    last_report = now
+
+            if pending:
+                f.write("\n".join(pending) + "\n")
+    except Exception as e:
+        result["error"] = str(e)
+
+    elapsed = time.perf_counter() - start
+    result.update(count=count, seconds=elapsed,
+                  cancelled=cancel is not None and cancel.is_set())
+    if on_progress:
+        on_progress(count, count / elapsed if elapsed else 0.0)
+
+    if result["error"] is None and not result["cancelled"]:
+        try:
+            os.replace(partial, output)
+            return result
+        except OSError as e:
+            result["error"] = str(e)
+
+    if count:
+        result["path"] = partial
+    else:
+        result["path"] = None
+        try:
+            os.remove(partial)
+        except OSError:
+            pass
+    return result
+
+
+def download_batch(urls, out_dir=".", max_workers=MAX_WORKERS,
+                   downloader_factory=default_downloader, sort_by=SORT_BY_RECENT,
+                   on_progress=None, cancel=None):
+    """
+    Fetch several videos concurrently with a bounded thread pool.
+    URLs naming the same video are fetched once, since they share an output file.
+    Each worker gets its own client from `downloader_factory`.
+    `on_progress(url, count, rate)` reports per video.
+    Returns the result dicts in the order the videos finished.
+    """
+    cancel = cancel or threading.Event()
+    unique = {}
+    for url in urls:
+        unique.setdefault(video_id(url), url)
+    urls = list(unique.values())
+
+    def run(url):
+        if cancel.is_set():
+            return {"url": url, "path": None, "count": 0, "seconds": 0.0,
+                    "cancelled": True, "error": None}
+        try:
+            downloader = downloader_factory()
+        except Exception as e:
+            return {"url": url, "path": None, "count": 0, "seconds": 0.0,
+                    "cancelled": False, "error": str(e)}
+        report = (lambda count, rate: on_progress(url, count, rate)) if on_progress else None
+        return download_comments(url, out_dir, downloader=downloader, sort_by=sort_by,
+                                 on_progress=report, cancel=cancel)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls) or 1))) as pool:
+        futures = [pool.submit(run, url) for url in urls]
+        try:
+            for future in as_completed(futures):
+                results.append(future.result())
+        except KeyboardInterrupt:
+            # Stop running workers before the pool waits on them
+            cancel.set()
+            raise
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream YouTube comments to JSON Lines.")
+    parser.add_argument("urls", nargs="+", help="YouTube video URL(s)")
+    parser.add_argument("-o", "--out-dir", default=".", help="Directory for comments_<id>.jsonl")
+    parser.add_argument("-j", "--jobs", type=int, default=MAX_WORKERS, help="Videos fetched at once")
+    parser.add_argument("--popular", action="store_true", help="Sort by popular instead of newest")
+    parser.add_argument("--replay", help="Recorded JSONL file/directory to use instead of YouTube")
+    args = parser.parse_args()
+
+    factory = (lambda: ReplayDownloader(args.replay)) if args.replay else default_downloader
+    counts = {}
+    lock = threading.Lock()
+
+    def show(url, count, rate):
+        with lock:
+            counts[url] = (count, rate)
+            total = sum(c for c, _ in counts.values())
+            speed = sum(r for _, r in counts.values())
+            sys.stdout.write(f"\rDownloaded {total} comment(s) ({speed:.1f}/s)   ")
+            sys.stdout.flush()
+
+    try:
+        results = download_batch(args.urls, args.out_dir, args.jobs, factory,
+                                 SORT_BY_POPULAR if args.popular else SORT_BY_RECENT,
+                                 on_progress=show)
+    except KeyboardInterrupt:
+        print("\nCancelled.")
+        sys.exit(130)
+
+    print()
+    failed = 0
+    for r in results:
+        if r["error"]:
+            failed += 1
+            print(f"❌ {r['url']}: {r['error']}")
+        else:
+            print(f"✅ {r['url']}: {r['count']} comments → {r['path']}")
+    sys.exit(1 if failed else 0)
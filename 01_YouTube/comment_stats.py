@@ -0,0 +1,156 @@
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from comment_convert import iter_rows
+
+# Settings
+TOP_AUTHORS = 20            # Authors kept in the summary
+TOP_VOTES = 10              # Most voted comments kept in the summary
+TIME_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400,
+              "week": 604800, "month": 2592000, "year": 31536000}
+
+
+def time_bucket(time_text):
+    """
+    Normalize YouTube's relative time ("3 months ago (edited)" → "3 months ago").
+    """
+    return time_text.split("(")[0].strip()
+
+
+def bucket_age(bucket):
+    """
+    Approximate age of a time bucket in seconds, used to order histograms.
+    Unknown formats sort last.
+    """
+    match = re.match(r"^(\d+)\s+(second|minute|hour|day|week|month|year)s?\b", bucket)
+    if not match:
+        return float("inf")
+    return int(match.group(1)) * TIME_UNITS[match.group(2)]
+
+
+class CommentAggregator:
+    """
+    One-pass statistics over comment rows (see comment_convert.iter_rows).
+    Keeps counters, time-bucket histograms and a bounded heap of the top-K
+    voted comments. Aggregators from different shards combine with merge().
+    """
+
+    def __init__(self, top_k=TOP_VOTES):
+        self.top_k = top_k
+        self.comments = 0
+        self.votes_total = 0
+        self.videos = Counter()
+        self.authors = Counter()
+        self.time_buckets = Counter()
+        self.heart = Counter()
+        self.reply = Counter()
+        self._top = []              # min-heap of (votes, seq, record)
+        self._seq = 0               # tie-breaker so records are never compared
+
+    def _push(self, votes, record):
+        if self.top_k <= 0:
+            return
+        self._seq += 1
+        item = (votes, self._seq, record)
+        if len(self._top) < self.top_k:
+            heapq.heappush(self._top, item)
+        elif votes > self._top[0][0]:
+            heapq.heapreplace(self._top, item)
+
+    def add(self, row, video=""):
+        _, cid, text, time, author, votes, reply, heart = row
+        self.comments += 1
+        self.votes_total += votes
+        self.videos[video] += 1
+        self.authors[author] += 1
+        self.time_buckets[time_bucket(time)] += 1
+        self.heart[heart] += 1
+        self.reply[reply] += 1
+        # Only build the record when it can enter the heap
+        if self.top_k > 0 and (len(self._top) < self.top_k or votes > self._top[0][0]):
+            self._push(votes, {"video": video, "cid": cid, "text": text, "time": time,
+                               "author": author, "votes": votes, "reply": reply, "heart": heart})
+
+    def merge(self, other):
+        self.comments += other.comments
+        self.votes_total += other.votes_total
+        self.videos.update(other.videos)
+        self.authors.update(other.authors)
+        self.time_buckets.update(other.time_buckets)
+        self.heart.update(other.heart)
+        self.reply.update(other.reply)
+        for votes, _, record in other._top:
+            self._push(votes, record)
+        return self
+
+    def top_votes(self):
+        return [record for _, _, record in sorted(self._top, key=lambda item: (-item[0], item[1]))]
+
+    def summary(self, top_authors=TOP_AUTHORS):
+        """
+        Compact, JSON-serializable result for plotting.
+        """
+        buckets = sorted(self.time_buckets.items(), key=lambda kv: (bucket_age(kv[0]), kv[0]))
+        return {
+            "comments": self.comments,
+            "votes_total": self.votes_total,
+            "videos": dict(self.videos),
+            "top_authors": self.authors.most_common(top_authors),
+            "unique_authors": len(self.authors),
+            "time_buckets": dict(buckets),
+            "heart": {"true": self.heart[True], "false": self.heart[False]},
+            "reply": {"true": self.reply[True], "false": self.reply[False]},
+            "top_votes": self.top_votes(),
+        }
+
+
+def aggregate_file(path, top_k=TOP_VOTES):
+    """
+    Aggregate a single JSON Lines dump; the video label is the file name.
+    """
+    video = os.path.splitext(os.path.basename(path))[0]
+    agg = CommentAggregator(top_k)
+    for row in iter_rows(path):
+        agg.add(row, video)
+    return agg
+
+
+def aggregate_files(paths, max_workers=None, top_k=TOP_VOTES):
+    """
+    Aggregate many dumps in a process pool and merge the shard results.
+    """
+    total = CommentAggregator(top_k)
+    if len(paths) == 1 or max_workers == 1:
+        for path in paths:
+            total.merge(aggregate_file(path, top_k))
+        return total
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for agg in pool.map(aggregate_file, paths, itertools.repeat(top_k)):
+            total.merge(agg)
+    return total
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize comment JSONL dumps without pandas.")
+    parser.add_argument("files", nargs="+", help="comments_<id>.jsonl dump(s)")
+    parser.add_argument("-o", "--output", help="Write summary JSON here instead of stdout")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("-k", "--top", type=int, default=TOP_VOTES, help="Top voted comments to keep")
+    args = parser.parse_args()
+
+    summary = aggregate_files(args.files, args.jobs, args.top).summary()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=1)
+        print(f"✅ {summary['comments']} comments from {len(summary['videos'])} video(s) → {args.output}")
+    else:
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=1)
+        print()
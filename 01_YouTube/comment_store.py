@@ -0,0 +1,249 @@
+import json
+import sqlite3
+import time
+
+from comment_convert import parse_bool, parse_votes
+from comment_fetcher import SORT_BY_RECENT, stream_comments, video_id
+
+# Settings
+STOP_AFTER_SEEN = 20        # Consecutive known top-level comments before a refresh stops
+BATCH_SIZE = 500            # Comments written per transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    video_id    TEXT NOT NULL,
+    cid         TEXT NOT NULL,
+    text        TEXT,
+    time        TEXT,
+    author      TEXT,
+    channel     TEXT,
+    votes       INTEGER NOT NULL DEFAULT 0,
+    reply       INTEGER NOT NULL DEFAULT 0,
+    heart       INTEGER NOT NULL DEFAULT 0,
+    time_parsed REAL,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    PRIMARY KEY (video_id, cid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_comments_newest ON comments (video_id, time_parsed DESC);
+CREATE INDEX IF NOT EXISTS idx_comments_votes ON comments (video_id, votes DESC);
+CREATE TABLE IF NOT EXISTS videos (
+    video_id     TEXT PRIMARY KEY,
+    url          TEXT,
+    last_refresh REAL,
+    complete     INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+UPSERT = """
+INSERT INTO comments (video_id, cid, text, time, author, channel, votes, reply, heart,
+                      time_parsed, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (video_id, cid) DO UPDATE SET
+    text = excluded.text,
+    time = excluded.time,
+    votes = excluded.votes,
+    heart = excluded.heart,
+    last_seen = excluded.last_seen
+"""
+
+
+class CommentStore:
+    """
+    Local SQLite store of comments keyed by (video_id, cid).
+    Re-polling a video only inserts new comments and updates vote/heart
+    counts of known ones; single-video queries use the indexes.
+    """
+
+    def __init__(self, path="comments.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # Stores created before the `complete` flag existed
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(videos)")]
+        if "complete" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE videos ADD COLUMN complete INTEGER NOT NULL DEFAULT 0")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def known(self, vid, cid):
+        """
+        Return (votes, heart) of a stored comment, or None if it is new.
+        """
+        return self.conn.execute(
+            "SELECT votes, heart FROM comments WHERE video_id = ? AND cid = ?", (vid, cid)).fetchone()
+
+    def is_complete(self, vid):
+        """
+        True once a refresh of the video has reached its oldest comments.
+        """
+        row = self.conn.execute("SELECT complete FROM videos WHERE video_id = ?", (vid,)).fetchone()
+        return bool(row and row[0])
+
+    def upsert(self, vid, comments, seen_at=None):
+        """
+        Insert or update raw comment dicts (as yielded by the downloader).
+        """
+        seen_at = seen_at or time.time()
+        with self.conn:
+            self.conn.executemany(UPSERT, (
+                (vid, c["cid"], c.get("text", ""), c.get("time", ""), c.get("author", ""),
+                 c.get("channel"), parse_votes(c.get("votes")), parse_bool(c.get("reply")),
+                 parse_bool(c.get("heart")), c.get("time_parsed"), seen_at, seen_at)
+                for c in comments))
+
+    def import_jsonl(self, path, vid):
+        """
+        Seed the store from an existing JSON Lines dump.
+        The video stays incomplete, so its first refresh is a full one.
+        """
+        batch, count = [], 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                batch.append(json.loads(line))
+                if len(batch) >= BATCH_SIZE:
+                    self.upsert(vid, batch)
+                    count += len(batch)
+                    batch = []
+        if batch:
+            self.upsert(vid, batch)
+            count += len(batch)
+        return count
+
+    def refresh(self, url, downloader=None, full=False, stop_after_seen=STOP_AFTER_SEEN,
+                on_progress=None, cancel=None):
+        """
+        Fetch newest-first and stop after `stop_after_seen` consecutive known
+        top-level comments (the threshold skips past pinned comments).
+        Until one refresh of the video has run to completion, every refresh is
+        a full one, so a cancelled or failed run cannot leave a permanent gap.
+        New replies under older threads are only picked up with full=True.
+        Returns counts of new, updated and unchanged comments.
+        """
+        vid = video_id(url)
+        full = full or not self.is_complete(vid)
+        result = {"video_id": vid, "new": 0, "updated": 0, "unchanged": 0,
+                  "full": full, "stopped_early": False, "cancelled": False}
+        seen_run = 0
+        batch = []
+        finished = False
+
+        try:
+            for comment in stream_comments(url, downloader, SORT_BY_RECENT, cancel):
+                stored = self.known(vid, comment["cid"])
+                current = (parse_votes(comment.get("votes")), int(parse_bool(comment.get("heart"))))
+                if stored is None:
+                    result["new"] += 1
+                    seen_run = 0
+                    batch.append(comment)
+                else:
+                    if stored != current:
+                        result["updated"] += 1
+                        batch.append(comment)
+                    else:
+                        result["unchanged"] += 1
+                    if not parse_bool(comment.get("reply")):
+                        seen_run += 1
+
+                if len(batch) >= BATCH_SIZE:
+                    self.upsert(vid, batch)
+                    batch = []
+                if on_progress:
+                    on_progress(result)
+                if not full and seen_run >= stop_after_seen:
+                    result["stopped_early"] = True
+                    break
+            finished = True
+        finally:
+            # Keep what was fetched even if the download fails midway
+            if batch:
+                self.upsert(vid, batch)
+            result["cancelled"] = cancel is not None and cancel.is_set()
+            complete = finished and not result["cancelled"]
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO videos (video_id, url, last_refresh, complete) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (video_id) DO UPDATE SET url = excluded.url, "
+                    "last_refresh = excluded.last_refresh, complete = excluded.complete",
+                    (vid, url, time.time(), int(complete)))
+        return result
+
+    def videos(self):
+        return self.conn.execute(
+            "SELECT video_id, COUNT(*) FROM comments GROUP BY video_id ORDER BY video_id").fetchall()
+
+    def query(self, vid, order="newest", limit=None):
+        """
+        Rows of one video as dicts, ordered by "newest" or "votes".
+        """
+        order_by = {"newest": "time_parsed DESC, first_seen DESC",
+                    "votes": "votes DESC"}[order]
+        sql = ("SELECT cid, text, time, author, votes, reply, heart, time_parsed, first_seen, last_seen "
+               f"FROM comments WHERE video_id = ? ORDER BY {order_by}")
+        params = (vid,)
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+        cursor = self.conn.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def to_dataframe(self, vid, order="newest", limit=None):
+        """
+        One video's comments as a DataFrame with bool reply/heart columns.
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(self.query(vid, order, limit))
+        if not df.empty:
+            df["reply"] = df["reply"].astype(bool)
+            df["heart"] = df["heart"].astype(bool)
+        return df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally refresh comments into a local SQLite store.")
+    parser.add_argument("--db", default="comments.db", help="SQLite database file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_refresh = sub.add_parser("refresh", help="Fetch new comments for video URL(s)")
+    p_refresh.add_argument("urls", nargs="+")
+    p_refresh.add_argument("--full", action="store_true", help="Refetch everything (updates all vote counts)")
+    p_import = sub.add_parser("import", help="Load an existing JSONL dump")
+    p_import.add_argument("file")
+    p_import.add_argument("url", help="Video URL or id the dump belongs to")
+    sub.add_parser("list", help="Show stored videos")
+    args = parser.parse_args()
+
+    with CommentStore(args.db) as store:
+        if args.command == "refresh":
+            for url in args.urls:
+                try:
+                    r = store.refresh(url, full=args.full)
+                except Exception as e:
+                    print(f"❌ {url}: {e}")
+                    continue
+                note = (" (cancelled)" if r["cancelled"] else
+                        " (stopped at known comments)" if r["stopped_early"] else
+                        " (full refresh)" if r["full"] else "")
+                print(f"✅ {r['video_id']}: {r['new']} new, {r['updated']} updated, "
+                      f"{r['unchanged']} unchanged{note}")
+        elif args.command == "import":
+            vid = video_id(args.url)
+            print(f"✅ {vid}: imported {store.import_jsonl(args.file, vid)} comments")
+        else:
+            for vid, count in store.videos():
+                print(f"{vid}\t{count}")
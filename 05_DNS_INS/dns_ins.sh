@@ -6,7 +6,9 @@
 
 DOMAIN="${1:-github.com}"
 DNS_FILE="${2:-}"
-TIMEOUT=3
+TIMEOUT="${TIMEOUT:-3}"
+DNS_PORT="${DNS_PORT:-53}"     # override to test resolvers on non-standard ports
+HTTP_PORT="${HTTP_PORT:-80}"
 
 # ---------- Colors ----------
 RESET="\033[0m"
@@ -94,7 +96,7 @@ for entry in "${DNS_LIST[@]}"; do
   ((total++))
 
   start=$(date +%s%3N)
-  (dig @"$ip" "$DOMAIN" +short +time=$TIMEOUT +tries=1 >/tmp/dnsout.$$ 2>/dev/null) &
+  (dig @"$ip" -p "$DNS_PORT" "$DOMAIN" +short +time=$TIMEOUT +tries=1 >/tmp/dnsout.$$ 2>/dev/null) &
   spin $!
   wait $! 2>/dev/null
   end=$(date +%s%3N)
@@ -107,8 +109,8 @@ for entry in "${DNS_LIST[@]}"; do
     ((success++))
 
     http_code=$(curl -s -o /dev/null -w "%{http_code}" \
-      --resolve "${DOMAIN}:80:${resolved_ip}" \
-      --connect-timeout 3 "http://${DOMAIN}")
+      --resolve "${DOMAIN}:${HTTP_PORT}:${resolved_ip}" \
+      --connect-timeout "$TIMEOUT" "http://${DOMAIN}:${HTTP_PORT}")
 
     [[ "$time_ms" -lt "$fastest" ]] && {
       fastest=$time_ms
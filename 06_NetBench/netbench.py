@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+import argparse
+import base64
+import importlib.util
+import json
+import math
+import os
+import random
+import re
+import shutil
+import socket
+import socketserver
+import ssl
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Settings
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_CHECKER = os.path.join(ROOT, "02_ConfigChecker", "ConfigChecker.py")
+DNS_INS = os.path.join(ROOT, "05_DNS_INS", "dns_ins.sh")
+ZONE = "netbench.test"      # Synthetic hosts are h<N>.netbench.test
+MIN_ENTRIES = 10
+MAX_ENTRIES = 10_000
+HANG_SECONDS = 30           # How long a "lost" TCP connection is held open
+CONNECT_TIMEOUT = 5         # ConfigChecker's socket timeout in test_tls()
+TIMEOUT_SHARE = 0.9         # A failed check this close to a client timeout counts as "lost"
+ANSI = re.compile(r"\x1b\[[0-9;]*m")
+SETTINGS = ("tool", "entries", "workers", "seed", "dns_latency", "dns_jitter", "dns_loss", "dns_fail",
+            "dns_timeout", "tls_latency", "tls_jitter", "tls_loss", "tls_fail")
+
+
+# ---------- Fault profile ----------
+class Profile:
+    """
+    Latency / loss / failure behaviour of a stand-in server.
+    Each request's fate is drawn from a RNG seeded with (seed, key), so the
+    same key always gets the same fate regardless of thread scheduling.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, loss=0.0, fail=0.0, seed=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.fail = fail
+        self.seed = seed
+
+    def draw(self, key):
+        rng = random.Random(f"{self.seed}:{key}")
+        r = rng.random()
+        if r < self.loss:
+            action = "drop"
+        elif r < self.loss + self.fail:
+            action = "fail"
+        else:
+            action = "ok"
+        return action, self.latency + rng.random() * self.jitter
+
+
+class FaultCounter:
+    """
+    Mixin recording the fate keys of every fault a stand-in server injected,
+    so failures are attributed by the server that caused them.
+    Faults are counted per key: a host whose one DNS fate is hit by several
+    lookups counts once.
+    """
+
+    def init_counter(self):
+        self.faults = {"drop": set(), "fail": set()}
+        self.fault_lock = threading.Lock()
+
+    def record(self, action, key):
+        if action in self.faults:
+            with self.fault_lock:
+                self.faults[action].add(key)
+
+    def snapshot(self):
+        with self.fault_lock:
+            return {action: set(keys) for action, keys in self.faults.items()}
+
+    def faults_since(self, before):
+        now = self.snapshot()
+        return {"lost": len(now["drop"] - before["drop"]), "failed": len(now["fail"] - before["fail"])}
+
+
+# ---------- Stand-in DNS server ----------
+def parse_question(packet):
+    """
+    Return (name, qtype, end_offset) of the first question in a DNS packet.
+    """
+    labels, i = [], 12
+    while packet[i]:
+        length = packet[i]
+        labels.append(packet[i + 1:i + 1 + length].decode("ascii", "replace"))
+        i += length + 1
+    qtype, _ = struct.unpack("!HH", packet[i + 1:i + 5])
+    return ".".join(labels).lower(), qtype, i + 5
+
+
+def dns_response(query, rcode=0, ip="127.0.0.1"):
+    """
+    Build a reply to `query`: one A record for `ip`, or an empty answer with `rcode`.
+    """
+    tid, flags = struct.unpack("!HH", query[:4])
+    _, qtype, end = parse_question(query)
+    answer = b""
+    if rcode == 0 and qtype == 1:
+        answer = b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 60, 4) + socket.inet_aton(ip)
+    header = struct.pack("!HHHHHH", tid, 0x8080 | (flags & 0x0100) | rcode, 1, 1 if answer else 0, 0, 0)
+    return header + query[12:end] + answer
+
+
+class _DNSHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        query, sock = self.request
+        try:
+            name, _, _ = parse_question(query)
+        except (IndexError, struct.error):
+            return
+        key = self.server.fate_key(name)
+        action, delay = self.server.profile.draw(key)
+        self.server.record(action, key)
+        if action == "drop":
+            return
+        time.sleep(delay)
+        rcode = 0 if action == "ok" and name.endswith(ZONE) else (2 if action == "fail" else 3)
+        sock.sendto(dns_response(query, rcode), self.client_address)
+
+
+class StandInDNS(FaultCounter, socketserver.ThreadingUDPServer):
+    """
+    UDP DNS server on loopback answering every name in ZONE with 127.0.0.1.
+    Lost queries get no reply, failed ones get SERVFAIL, other zones NXDOMAIN.
+    """
+    daemon_threads = True
+
+    def __init__(self, profile, host="127.0.0.1", port=0):
+        super().__init__((host, port), _DNSHandler)
+        self.profile = profile
+        self.init_counter()
+        self.run = ""
+        self.per_query = True
+        self.queries = {}
+        self.lock = threading.Lock()
+
+    def start_run(self, run, per_query):
+        """
+        Start drawing fates for a new run. With per_query=False every lookup
+        of a host in the run shares one fate, like a client retrying a flaky
+        resolver; with per_query=True each query gets its own (dns_ins asks
+        one name of many resolvers).
+        """
+        self.run = run
+        self.per_query = per_query
+
+    def fate_key(self, name):
+        if not self.per_query:
+            return f"{self.run}:{name}"
+        with self.lock:
+            self.queries[name] = self.queries.get(name, 0) + 1
+            return f"{self.run}:{name}:{self.queries[name]}"
+
+
+def resolve(name, server, timeout):
+    """
+    Minimal A-record lookup against `server` (host, port). Returns an IP or None.
+    Raises socket.timeout when no reply arrives in time.
+    """
+    tid = random.getrandbits(16)
+    question = b"".join(bytes([len(p)]) + p.encode("ascii") for p in name.rstrip(".").split("."))
+    query = struct.pack("!HHHHHH", tid, 0x0100, 1, 0, 0, 0) + question + b"\x00" + struct.pack("!HH", 1, 1)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.sendto(query, server)
+        while True:
+            data, _ = sock.recvfrom(512)
+            if data[:2] == query[:2]:
+                break
+    flags, _, ancount = struct.unpack("!HHH", data[2:8])
+    if flags & 0x000F or not ancount:
+        return None
+    _, _, offset = parse_question(data)
+    for _ in range(ancount):
+        offset += 2 if data[offset] & 0xC0 == 0xC0 else data.index(b"\x00", offset) + 1 - offset
+        rtype, _, _, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        if rtype == 1 and rdlength == 4:
+            return socket.inet_ntoa(data[offset:offset + 4])
+        offset += rdlength
+    return None
+
+
+# ---------- Stand-in TLS / HTTP server ----------
+class _TCPHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        key = server.next_connection()
+        action, delay = server.profile.draw(key)
+        server.record(action, key)
+        if action == "drop":
+            # Accept but never answer: the client has to hit its timeout
+            server.stopping.wait(HANG_SECONDS)
+            return
+        if action == "fail":
+            return
+        time.sleep(delay)
+        conn = self.request
+        try:
+            if server.ssl_context:
+                conn = server.ssl_context.wrap_socket(conn, server_side=True)
+            conn.settimeout(2)
+            if conn.recv(4096):
+                conn.sendall(b"HTTP/1.1 301 Moved Permanently\r\nLocation: https://example.test/\r\n"
+                             b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+        except (OSError, ssl.SSLError):
+            pass
+        finally:
+            if conn is not self.request:
+                conn.close()
+
+
+class StandInTCP(FaultCounter, socketserver.ThreadingTCPServer):
+    """
+    Loopback HTTP server, or HTTPS when given an SSL context.
+    Lost connections hang without a reply, failed ones are closed at once.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self, profile, ssl_context=None, host="127.0.0.1", port=0):
+        super().__init__((host, port), _TCPHandler)
+        self.profile = profile
+        self.init_counter()
+        self.ssl_context = ssl_context
+        self.stopping = threading.Event()
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def next_connection(self):
+        with self.lock:
+            self.connections += 1
+            return self.connections
+
+    def server_close(self):
+        self.stopping.set()
+        super().server_close()
+
+
+def make_certificate(directory):
+    """
+    Self-signed certificate for *.ZONE via the openssl CLI. Returns (cert, key).
+    """
+    if not shutil.which("openssl"):
+        raise RuntimeError("Missing dependency: openssl (needed for the stand-in TLS server)")
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-nodes", "-days", "1",
+         "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1",
+         "-keyout", key, "-out", cert, "-subj", f"/CN={ZONE}",
+         "-addext", f"subjectAltName=DNS:{ZONE},DNS:*.{ZONE}"],
+        check=True, capture_output=True)
+    return cert, key
+
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+# ---------- Synthetic inputs ----------
+def make_configs(count, port, seed=1):
+    """
+    Mixed VLESS / Trojan / VMess links pointing at h<N>.ZONE:port.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for i in range(count):
+        host = f"h{i}.{ZONE}"
+        kind = rng.choice(["vless", "trojan", "vmess"])
+        path = rng.choice(["/ws", "/proxy", "/"])
+        if kind == "vmess":
+            body = json.dumps({"add": host, "port": str(port), "tls": "tls", "net": "ws", "host": host,
+                               "path": path, "encryption": "auto", "aid": "0"})
+            configs.append("vmess://" + base64.b64encode(body.encode()).decode())
+        else:
+            configs.append(f"{kind}://00000000-0000-0000-0000-{i:012d}@{host}:{port}"
+                           f"?type=ws&security=tls&host={host}&path={path}&encryption=none")
+    return configs
+
+
+def write_resolver_list(count, path):
+    """
+    dns_ins.sh resolver file: every entry points at the loopback stand-in.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(f"127.0.0.1|Stub{i}\n")
+
+
+# ---------- Client-side redirection ----------
+class redirect_network:
+    """
+    Route lookups for ZONE to the stand-in DNS server and trust the stand-in
+    certificate, so unmodified checker code talks only to loopback.
+    Other hostnames keep using the system resolver. Nothing is cached: every
+    lookup reaches the stand-in server.
+    """
+
+    def __init__(self, dns_server, cafile, timeout):
+        self.dns_server = dns_server
+        self.cafile = cafile
+        self.timeout = timeout
+
+    def _lookup(self, host):
+        try:
+            ip = resolve(host, self.dns_server, self.timeout)
+        except socket.timeout:
+            raise socket.gaierror(socket.EAI_AGAIN, "DNS query timed out")
+        if ip is None:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return ip
+
+    def __enter__(self):
+        self.saved = (socket.gethostbyname, socket.getaddrinfo, ssl.create_default_context)
+        gethostbyname, getaddrinfo, create_default_context = self.saved
+
+        def patched_gethostbyname(host):
+            return self._lookup(host) if str(host).endswith(ZONE) else gethostbyname(host)
+
+        def patched_getaddrinfo(host, *args, **kwargs):
+            if isinstance(host, str) and host.endswith(ZONE):
+                host = self._lookup(host)
+            return getaddrinfo(host, *args, **kwargs)
+
+        def patched_context(purpose=ssl.Purpose.SERVER_AUTH, *, cafile=None, **kwargs):
+            return create_default_context(purpose, cafile=cafile or self.cafile, **kwargs)
+
+        socket.gethostbyname = patched_gethostbyname
+        socket.getaddrinfo = patched_getaddrinfo
+        ssl.create_default_context = patched_context
+        return self
+
+    def __exit__(self, *exc):
+        socket.gethostbyname, socket.getaddrinfo, ssl.create_default_context = self.saved
+
+
+# ---------- Measurements ----------
+def percentiles(samples_ms):
+    if not samples_ms:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    ordered = sorted(samples_ms)
+
+    def rank(p):
+        return round(ordered[min(len(ordered) - 1, max(0, int(p * len(ordered) + 0.5) - 1))], 1)
+
+    return {"p50": rank(0.50), "p90": rank(0.90), "p99": rank(0.99), "max": round(ordered[-1], 1)}
+
+
+def load_config_checker():
+    spec = importlib.util.spec_from_file_location("ConfigChecker", CONFIG_CHECKER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def fault_report(**servers):
+    """
+    Injected faults per server, e.g. {"dns_lost": 3, "dns_failed": 1, ...}.
+    `servers` maps a label to (server, snapshot taken before the run).
+    """
+    failures = {}
+    for label, (server, before) in servers.items():
+        for kind, count in server.faults_since(before).items():
+            failures[f"{label}_{kind}"] = count
+    return failures
+
+
+def match_faults(injected, observed):
+    """
+    Pair injected faults with the failures the client reported, e.g.
+    {"dns_lost": {"injected": 3, "observed": 3}, ...}, and list the kinds
+    where they disagree (a broken setup rather than a flaky network).
+    """
+    failures = {kind: {"injected": count, "observed": observed.get(kind, 0)}
+                for kind, count in injected.items()}
+    for kind, count in observed.items():
+        failures.setdefault(kind, {"injected": 0, "observed": count})
+    mismatch = [f"{kind}: injected {f['injected']}, observed {f['observed']}"
+                for kind, f in failures.items() if f["injected"] != f["observed"]]
+    return failures, mismatch
+
+
+def classify_checks(results, dns_timeout):
+    """
+    Count ConfigChecker outcomes from (ms, issues) pairs. A failed check that
+    ran close to the DNS or connect timeout is "lost", otherwise "failed".
+    A TLS failure after a failed lookup is blamed on DNS only.
+    """
+    observed = Counter()
+    for ms, issues in results:
+        tls_issue = next((i for i in issues if i.startswith("TLS handshake failed")), None)
+        if any("does not resolve" in i for i in issues):
+            observed["dns_lost" if ms >= TIMEOUT_SHARE * dns_timeout * 1000 else "dns_failed"] += 1
+        elif tls_issue:
+            timed_out = "timed out" in tls_issue or ms >= TIMEOUT_SHARE * CONNECT_TIMEOUT * 1000
+            observed["tls_lost" if timed_out else "tls_failed"] += 1
+    return observed
+
+
+def bench_config_checker(configs, dns, https, cafile, workers=1, dns_timeout=3.0):
+    """
+    Run evaluate_security() over every config and time each check.
+    Lost DNS queries and hanging TLS connections surface as client timeouts.
+    Each host gets one DNS fate for the whole run.
+    """
+    checker = load_config_checker()
+    dns.start_run("configchecker", per_query=False)
+    before = {"dns": (dns, dns.snapshot()), "tls": (https, https.snapshot())}
+
+    def check(config):
+        start = time.perf_counter()
+        _, issues = checker.evaluate_security(config)
+        return (time.perf_counter() - start) * 1000, issues
+
+    with redirect_network(dns.server_address, cafile, dns_timeout):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(check, configs))
+        elapsed = time.perf_counter() - start
+
+    failures, mismatch = match_faults(fault_report(**before), classify_checks(results, dns_timeout))
+    return {"tool": "configchecker", "checks": len(configs), "workers": workers,
+            "seconds": round(elapsed, 3), "checks_per_sec": round(len(configs) / elapsed, 2),
+            "latency_ms": percentiles([ms for ms, _ in results]),
+            "failures": failures, "mismatch": mismatch}
+
+
+def bench_dns_ins(count, dns, http, workdir, timeout=3.0):
+    """
+    Run dns_ins.sh against `count` stand-in resolvers and parse its table.
+    dig only takes whole seconds, so `timeout` is rounded up.
+    A non-zero exit or a table without rows is reported as an error.
+    """
+    missing = [cmd for cmd in ("bash", "dig", "curl") if not shutil.which(cmd)]
+    if missing:
+        return {"tool": "dns_ins", "skipped": f"missing dependency: {', '.join(missing)}"}
+
+    resolvers = os.path.join(workdir, "resolvers.txt")
+    write_resolver_list(count, resolvers)
+    timeout = max(1, math.ceil(timeout))
+    dns.start_run("dns_ins", per_query=True)
+    before = {"dns": (dns, dns.snapshot()), "http": (http, http.snapshot())}
+    env = dict(os.environ, DNS_PORT=str(dns.server_address[1]), HTTP_PORT=str(http.server_address[1]),
+               TIMEOUT=str(timeout), TERM="dumb")
+    start = time.perf_counter()
+    proc = subprocess.run(["bash", DNS_INS, f"h0.{ZONE}", resolvers],
+                          env=env, capture_output=True, encoding="utf-8", errors="replace")
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for line in ANSI.sub("", proc.stdout).splitlines():
+        match = re.search(r"\s(✔|✖)\s+\S+\s+(\d+)\s*ms\s+(\S+)", line)
+        if match:
+            rows.append((match.group(1), int(match.group(2)), match.group(3)))
+    if proc.returncode or not rows:
+        stderr = " | ".join(proc.stderr.strip().splitlines()[-5:]) or "no output on stderr"
+        reason = f"exit code {proc.returncode}" if proc.returncode else "no result rows"
+        return {"tool": "dns_ins", "error": f"dns_ins.sh failed ({reason}): {stderr}"}
+
+    observed = Counter()
+    for status, ms, http_code in rows:
+        if status == "✖":
+            observed["dns_lost" if ms >= TIMEOUT_SHARE * timeout * 1000 else "dns_failed"] += 1
+        elif http_code != "301":
+            observed["http_failed"] += 1
+    # curl has no overall time limit, so a hanging server looks like a closed one
+    injected = fault_report(**before)
+    injected["http_failed"] += injected.pop("http_lost")
+    failures, mismatch = match_faults(injected, observed)
+    times = [ms for _, ms, _ in rows]
+    return {"tool": "dns_ins", "checks": len(times), "workers": 1, "timeout": timeout,
+            "seconds": round(elapsed, 3), "checks_per_sec": round(len(times) / elapsed, 2) if elapsed else 0,
+            "latency_ms": percentiles(times), "failures": failures, "mismatch": mismatch}
+
+
+# ---------- Regression check ----------
+def settings_mismatch(report, baseline):
+    """
+    Settings that differ between two reports; such runs are not comparable.
+    """
+    old, new = baseline.get("params", {}), report["params"]
+    return [f"{key}: baseline {old.get(key)!r}, now {new.get(key)!r}"
+            for key in SETTINGS if old.get(key) != new.get(key)]
+
+
+def compare(report, baseline, tolerance):
+    """
+    Flag tools whose throughput fell or p99 latency rose by more than `tolerance`.
+    """
+    regressions = []
+    old = {r["tool"]: r for r in baseline.get("results", []) if "skipped" not in r and "error" not in r}
+    for new in report["results"]:
+        before = old.get(new["tool"])
+        if not before or "skipped" in new or "error" in new:
+            continue
+        if new["checks_per_sec"] < before["checks_per_sec"] * (1 - tolerance):
+            regressions.append(f"{new['tool']}: throughput {before['checks_per_sec']} → {new['checks_per_sec']} checks/s")
+        p99_old, p99_new = before["latency_ms"]["p99"], new["latency_ms"]["p99"]
+        if p99_old and p99_new and p99_new > p99_old * (1 + tolerance):
+            regressions.append(f"{new['tool']}: p99 latency {p99_old} → {p99_new} ms")
+    return regressions
+
+
+def print_report(report):
+    print(f"\n{'Tool':<14} {'Checks':>7} {'Workers':>7} {'Checks/s':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+          "  Failures (injected/observed)")
+    print("─" * 110)
+    for r in report["results"]:
+        if "skipped" in r:
+            print(f"{r['tool']:<14} skipped ({r['skipped']})")
+            continue
+        if "error" in r:
+            print(f"{r['tool']:<14} failed: {r['error']}")
+            continue
+        lat = {k: "—" if v is None else v for k, v in r["latency_ms"].items()}
+        fails = ", ".join(f"{k}={v['injected']}/{v['observed']}" for k, v in r["failures"].items())
+        print(f"{r['tool']:<14} {r['checks']:>7} {r['workers']:>7} {r['checks_per_sec']:>9} "
+              f"{lat['p50']:>8} {lat['p90']:>8} {lat['p99']:>8} {lat['max']:>8}  {fails}")
+    for r in report["results"]:
+        if r.get("mismatch"):
+            print(f"\n⚠️  {r['tool']}: observed failures do not match the injected ones:")
+            for m in r["mismatch"]:
+                print(f" - {m}")
+    print()
+
+
+def entry_count(value):
+    count = int(value)
+    if not MIN_ENTRIES <= count <= MAX_ENTRIES:
+        raise argparse.ArgumentTypeError(f"entries must be between {MIN_ENTRIES} and {MAX_ENTRIES}")
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark for ConfigChecker.py and dns_ins.sh.")
+    parser.add_argument("--tool", choices=["configchecker", "dns_ins", "all"], default="all")
+    parser.add_argument("-n", "--entries", type=entry_count, default=100,
+                        help=f"Synthetic configs / resolvers ({MIN_ENTRIES}-{MAX_ENTRIES})")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Concurrent ConfigChecker checks")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dns-latency", type=float, default=0.02, help="Seconds added to each DNS reply")
+    parser.add_argument("--dns-jitter", type=float, default=0.01)
+    parser.add_argument("--dns-loss", type=float, default=0.0, help="Fraction of DNS queries never answered")
+    parser.add_argument("--dns-fail", type=float, default=0.0, help="Fraction answered with SERVFAIL")
+    parser.add_argument("--dns-timeout", type=float, default=3.0, help="Client DNS timeout (ConfigChecker lookups; dig/curl in dns_ins, rounded up to whole seconds)")
+    parser.add_argument("--tls-latency", type=float, default=0.02, help="Seconds before the TLS/HTTP server answers")
+    parser.add_argument("--tls-jitter", type=float, default=0.01)
+    parser.add_argument("--tls-loss", type=float, default=0.0, help="Fraction of connections left hanging")
+    parser.add_argument("--tls-fail", type=float, default=0.0, help="Fraction of connections closed at once")
+    parser.add_argument("--save", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression (fraction)")
+    args = parser.parse_args()
+
+    dns_profile = Profile(args.dns_latency, args.dns_jitter, args.dns_loss, args.dns_fail, args.seed)
+    tcp_profile = Profile(args.tls_latency, args.tls_jitter, args.tls_loss, args.tls_fail, args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="netbench-") as workdir:
+        cert, key = make_certificate(workdir)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+
+        dns = serve(StandInDNS(dns_profile))
+        https = serve(StandInTCP(tcp_profile, context))
+        http = serve(StandInTCP(tcp_profile))
+        try:
+            results = []
+            if args.tool in ("configchecker", "all"):
+                configs = make_configs(args.entries, https.server_address[1], args.seed)
+                results.append(bench_config_checker(configs, dns, https, cert,
+                                                    args.workers, args.dns_timeout))
+            if args.tool in ("dns_ins", "all"):
+                results.append(bench_dns_ins(args.entries, dns, http, workdir, args.dns_timeout))
+        finally:
+            for server in (dns, https, http):
+                server.shutdown()
+                server.server_close()
+
+    report = {"date": time.strftime("%Y-%m-%d %H:%M:%S"), "params": vars(args), "results": results}
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        print(f"Report saved to {args.save}")
+
+    broken = [r["tool"] for r in results if "error" in r or r.get("mismatch")]
+    if broken:
+        print(f"❌ Run is not trustworthy ({', '.join(broken)}): fix the setup before comparing.")
+        sys.exit(3)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        mismatches = settings_mismatch(report, baseline)
+        if mismatches:
+            print("❌ Baseline was run with different settings, results are not comparable:")
+            for m in mismatches:
+                print(f" - {m}")
+            sys.exit(2)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("❌ Regressions:")
+            for r in regressions:
+                print(f" - {r}")
+            sys.exit(1)
+        print("✅ No regressions against baseline.")